@@ -9,12 +9,545 @@ import time
 import webbrowser
 import threading
 import json
-from http.server import HTTPServer, SimpleHTTPRequestHandler
-from urllib.parse import quote
+import difflib
+import gzip
+import hashlib
+import queue
+import re
+import tracemalloc
+import urllib.request
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from html.parser import HTMLParser
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from urllib.parse import parse_qs, quote, urlparse
 import tempfile
 import sys
 from functools import partial
 
+class EventBroadcaster:
+    """Fan-out broadcaster for Server-Sent Events"""
+    
+    def __init__(self, history_size=100, max_subscribers=100):
+        self.lock = threading.Lock()
+        self.max_subscribers = max_subscribers
+        self.subscribers = []
+        self.history = deque(maxlen=history_size)
+        self.last_id = 0
+        # Changes on every restart so clients can tell ids and versions from a previous process
+        self.epoch = os.urandom(4).hex()
+    
+    def publish(self, event, data, replay=True):
+        """Send an event to every connected dashboard
+        
+        Only replay events get an id and a place in the Last-Event-ID history;
+        state snapshots such as metrics are sent to current listeners only.
+        """
+        with self.lock:
+            if replay:
+                self.last_id += 1
+                message = (self.last_id, event, json.dumps(data))
+                self.history.append(message)
+            else:
+                message = (None, event, json.dumps(data))
+            for subscriber in self.subscribers:
+                subscriber.put(message)
+    
+    def subscribe(self, last_event_id=None):
+        """Register a new listener, replaying events missed since last_event_id
+        
+        last_event_id is an "<epoch>-<id>" string as sent by EventSource; one
+        from a previous process replays the whole history. Returns None when
+        max_subscribers listeners are already connected.
+        """
+        subscriber = queue.Queue()
+        with self.lock:
+            if len(self.subscribers) >= self.max_subscribers:
+                return None
+            last_event_id = self.parse_event_id(last_event_id)
+            if last_event_id is not None:
+                for message in self.history:
+                    if message[0] > last_event_id:
+                        subscriber.put(message)
+            self.subscribers.append(subscriber)
+        return subscriber
+    
+    def parse_event_id(self, last_event_id):
+        """Map a Last-Event-ID header to a history id (0 for another epoch, None if absent or malformed)"""
+        epoch, _, event_id = (last_event_id or '').rpartition('-')
+        if not epoch or not event_id.isdigit():
+            return None
+        return int(event_id) if epoch == self.epoch else 0
+    
+    def format_event_id(self, event_id):
+        """The id line value sent for a history id"""
+        return '%s-%d' % (self.epoch, event_id)
+    
+    def unsubscribe(self, subscriber):
+        """Remove a listener"""
+        with self.lock:
+            if subscriber in self.subscribers:
+                self.subscribers.remove(subscriber)
+    
+    def subscriber_count(self):
+        """Number of connected listeners"""
+        with self.lock:
+            return len(self.subscribers)
+    
+    def close(self):
+        """Wake every listener so its stream can end"""
+        with self.lock:
+            for subscriber in self.subscribers:
+                subscriber.put(None)
+
+def deep_sizeof(obj, seen=None):
+    """Approximate memory used by obj and the containers/strings it references"""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    return size
+
+class ArtifactCache:
+    """Thread-safe LRU cache for generated artifacts bounded by total size in bytes"""
+    
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.lock = threading.Lock()
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get_or_build(self, key, builder):
+        """Return the cached value for key, building and storing it on a miss"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        
+        value = builder()
+        self.put(key, value)
+        return value
+    
+    def get(self, key):
+        """Return the cached value for key, or None on a miss"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def discard(self, key):
+        """Drop key if it is cached"""
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry is not None:
+                self.current_bytes -= entry[1]
+    
+    def put(self, key, value):
+        """Store value, evicting least recently used entries until it fits the budget"""
+        size = deep_sizeof(value)
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self.entries[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+    
+    def entry_sizes(self):
+        """(key, size in bytes) for every cached entry, least recently used first"""
+        with self.lock:
+            return [(key, size) for key, (_, size) in self.entries.items()]
+    
+    def stats(self):
+        """Hit/miss/eviction counters and current usage"""
+        with self.lock:
+            return {
+                'entries': len(self.entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+LINE_PATTERN = re.compile(r'[^\n]*\n|[^\n]+\Z')
+
+def utf16_length(text):
+    """Length of text as JavaScript counts it (UTF-16 code units)"""
+    return len(text.encode('utf-16-le')) // 2
+
+def prompt_delta(old, new, max_diff_cells=1000000):
+    """Line-based edit script turning old into new
+    
+    Ops are ['=', n] (keep n lines), ['-', n] (drop n lines) and ['+', text]
+    (insert text); the dashboard applies them with applyPromptDelta.
+    Common leading and trailing lines are matched in linear time. Only the
+    changed middle goes through SequenceMatcher, which is quadratic on
+    repeated lines, and when that middle spans more than max_diff_cells
+    line pairs it is replaced wholesale instead.
+    """
+    old_lines = LINE_PATTERN.findall(old)
+    new_lines = LINE_PATTERN.findall(new)
+    shortest = min(len(old_lines), len(new_lines))
+    prefix = 0
+    while prefix < shortest and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < shortest - prefix and old_lines[-1 - suffix] == new_lines[-1 - suffix]:
+        suffix += 1
+    old_middle = old_lines[prefix:len(old_lines) - suffix]
+    new_middle = new_lines[prefix:len(new_lines) - suffix]
+    
+    ops = [['=', prefix]] if prefix else []
+    if len(old_middle) * len(new_middle) > max_diff_cells:
+        ops.append(['-', len(old_middle)])
+        ops.append(['+', ''.join(new_middle)])
+    else:
+        matcher = difflib.SequenceMatcher(None, old_middle, new_middle, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == 'equal':
+                ops.append(['=', i2 - i1])
+                continue
+            if i2 > i1:
+                ops.append(['-', i2 - i1])
+            if j2 > j1:
+                ops.append(['+', ''.join(new_middle[j1:j2])])
+    if suffix:
+        ops.append(['=', suffix])
+    return ops
+
+def fingerprint_name(name, content):
+    """Insert a short content hash before the extension, e.g. app.css -> app.1a2b3c4d5e.css"""
+    stem, ext = os.path.splitext(name)
+    return stem + '.' + hashlib.sha256(content.encode('utf-8')).hexdigest()[:10] + ext
+
+def write_static_file(output, relative_path, content):
+    """Write content and a precompressed .gz copy, skipping identical files already on disk
+    
+    Returns True when the file was (re)written.
+    """
+    path = os.path.join(output, relative_path)
+    data = content.encode('utf-8')
+    if os.path.exists(path) and os.path.exists(path + '.gz'):
+        try:
+            with open(path, 'rb') as file:
+                if file.read() == data:
+                    return False
+        except OSError:
+            pass
+    
+    # Stage both files first so the page and its .gz copy are replaced together
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path + '.tmp', 'wb') as file:
+        file.write(data)
+    with open(path + '.gz.tmp', 'wb') as file:
+        file.write(gzip.compress(data, mtime=0))
+    os.replace(path + '.gz.tmp', path + '.gz')
+    os.replace(path + '.tmp', path)
+    return True
+
+def render_static_prompt(slug, prompt, ai_tools, assets, output):
+    """Render one prompt's dashboard page, bookmarklet and per-tool injection scripts into the export tree"""
+    checker = EnhancedAIChecker()
+    checker.ai_tools = ai_tools
+    checker.prompt_snapshot = (1, prompt)
+    base = 'prompts/' + slug + '/'
+    
+    bookmarklet = json.dumps({'bookmarklet': checker.generate_universal_bookmarklet()})
+    contents = {'bookmarklet': bookmarklet}
+    files = {'bookmarklet': base + fingerprint_name('bookmarklet.json', bookmarklet)}
+    for name, config in ai_tools.items():
+        safe_name = name.replace('.', '_').replace(' ', '_')
+        script = checker.generate_injection_script(name, config)
+        contents['inject/' + safe_name] = script
+        files['inject/' + safe_name] = base + 'inject/' + fingerprint_name(safe_name + '.js', script)
+    html = checker.get_html(static_assets={
+        'css': '../../' + assets['css'],
+        'js': '../../' + assets['js'],
+        'bookmarklet': os.path.basename(files['bookmarklet'])
+    })
+    contents['html'] = html
+    files['html'] = base + 'index.html'
+    
+    written = 0
+    for key, content in contents.items():
+        written += write_static_file(output, files[key], content)
+    return slug, files, written
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one in-progress computation"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.calls = {}
+    
+    def do(self, key, func, linger=0):
+        """Run func once per key; callers arriving meanwhile (or within linger seconds) share its result
+        
+        Returns (result, shared) where shared is True for callers that reused
+        another caller's computation.
+        """
+        now = time.monotonic()
+        with self.lock:
+            for stale_key in [k for k, c in self.calls.items()
+                              if c['finished'] is not None and now - c['finished'] > c['linger']]:
+                del self.calls[stale_key]
+            call = self.calls.get(key)
+            leader = call is None
+            if leader:
+                call = {'done': threading.Event(), 'result': None, 'error': None,
+                        'finished': None, 'linger': linger}
+                self.calls[key] = call
+        
+        if not leader:
+            call['done'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result'], True
+        
+        try:
+            call['result'] = func()
+        except Exception as e:
+            call['error'] = e
+            raise
+        finally:
+            with self.lock:
+                call['finished'] = time.monotonic()
+                if (call['error'] is not None or not linger) and self.calls.get(key) is call:
+                    del self.calls[key]
+            call['done'].set()
+        return call['result'], False
+    
+    def pending(self, key):
+        """Whether a call for key is running or its result is still within its linger window"""
+        with self.lock:
+            call = self.calls.get(key)
+            return call is not None and (call['finished'] is None
+                                         or time.monotonic() - call['finished'] <= call['linger'])
+
+class AdmissionRejected(Exception):
+    """Raised when admission control sheds work started outside do_GET"""
+
+class AdmissionController:
+    """Per-route concurrency limits with bounded waiting and per-client rate limits
+    
+    Requests beyond a route's limit wait (up to queue_timeout) in a queue of
+    at most max_queue; anything beyond that is rejected immediately so the
+    server can answer 503 with Retry-After instead of piling up threads.
+    """
+    
+    def __init__(self, route_limits=None, max_queue=32, queue_timeout=5, retry_after=2,
+                 rate_limits=None):
+        self.route_limits = route_limits or {
+            '/': 8,
+            '/open-all': 2,
+            '/get-injection-bookmarklet': 8,
+            '/api/prompt': 16,
+            '*': 16
+        }
+        # Action routes: (tokens per second, burst) per client
+        self.rate_limits = rate_limits or {'/open-all': (0.2, 3)}
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.condition = threading.Condition()
+        self.active = {}
+        self.waiting = {}
+        self.buckets = {}
+        self.metrics = {}
+    
+    def route_key(self, route):
+        """Bucket unknown routes (static files, debug pages) under '*'"""
+        return route if route in self.route_limits else '*'
+    
+    def route_metrics(self, key):
+        """Counters for one route key; caller holds the condition lock"""
+        return self.metrics.setdefault(key, {
+            'admitted': 0, 'rejected': 0, 'rate_limited': 0,
+            'queued': 0, 'queue_ms_total': 0.0, 'queue_ms_max': 0.0
+        })
+    
+    def check_rate(self, client, route):
+        """Take a token for rate-limited routes; returns seconds to wait when the client is over its limit"""
+        if route not in self.rate_limits:
+            return 0
+        rate, burst = self.rate_limits[route]
+        now = time.monotonic()
+        with self.condition:
+            if len(self.buckets) > 1024:
+                self.buckets = {k: v for k, v in self.buckets.items()
+                                if v[0] + (now - v[1]) * self.rate_limits[k[1]][0] < self.rate_limits[k[1]][1]}
+            tokens, updated = self.buckets.get((client, route), (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            if tokens < 1:
+                self.buckets[(client, route)] = (tokens, now)
+                self.route_metrics(route)['rate_limited'] += 1
+                return max(1, int((1 - tokens) / rate + 0.999))
+            self.buckets[(client, route)] = (tokens - 1, now)
+            return 0
+    
+    def acquire(self, route):
+        """Admit a request for route, waiting for a free slot if needed; returns False when shed"""
+        key = self.route_key(route)
+        limit = self.route_limits[key]
+        started = time.monotonic()
+        with self.condition:
+            metrics = self.route_metrics(key)
+            if self.active.get(key, 0) >= limit:
+                if self.waiting.get(key, 0) >= self.max_queue:
+                    metrics['rejected'] += 1
+                    return False
+                self.waiting[key] = self.waiting.get(key, 0) + 1
+                metrics['queued'] += 1
+                admitted = self.condition.wait_for(lambda: self.active.get(key, 0) < limit,
+                                                   timeout=self.queue_timeout)
+                self.waiting[key] -= 1
+                if not admitted:
+                    metrics['rejected'] += 1
+                    return False
+            self.active[key] = self.active.get(key, 0) + 1
+            queue_ms = (time.monotonic() - started) * 1000
+            metrics['admitted'] += 1
+            metrics['queue_ms_total'] += queue_ms
+            metrics['queue_ms_max'] = max(metrics['queue_ms_max'], queue_ms)
+            return True
+    
+    def release(self, route):
+        """Free the slot taken by acquire"""
+        key = self.route_key(route)
+        with self.condition:
+            self.active[key] -= 1
+            self.condition.notify_all()
+    
+    def stats(self):
+        """Per-route load and queue-time metrics"""
+        with self.condition:
+            return {
+                key: dict(metrics,
+                          active=self.active.get(key, 0),
+                          waiting=self.waiting.get(key, 0),
+                          queue_ms_avg=metrics['queue_ms_total'] / metrics['admitted'] if metrics['admitted'] else 0.0)
+                for key, metrics in self.metrics.items()
+            }
+
+SELECTOR_PATTERN = re.compile(r'^([a-zA-Z][\w-]*|\*)?((?:\[[^\]]+\]|[#.][\w-]+)*)$')
+SELECTOR_PART_PATTERN = re.compile(r'\[\s*([\w:-]+)\s*(?:([~^$*|]?=)\s*(?:"([^"]*)"|\'([^\']*)\'|([^\]\s]*)))?\s*\]|([#.])([\w-]+)')
+
+def compile_selector(selector):
+    """Compile a compound CSS selector into (tag, [(attr, op, value)]) or None if unsupported"""
+    match = SELECTOR_PATTERN.match(selector.strip())
+    if not match:
+        return None
+    tag = match.group(1)
+    conditions = []
+    for part in SELECTOR_PART_PATTERN.finditer(match.group(2)):
+        if part.group(6) == '#':
+            conditions.append(('id', '=', part.group(7)))
+        elif part.group(6) == '.':
+            conditions.append(('class', '~=', part.group(7)))
+        else:
+            value = next((v for v in part.group(3, 4, 5) if v is not None), None)
+            conditions.append((part.group(1).lower(), part.group(2), value))
+    return (None if tag in (None, '*') else tag.lower(), conditions)
+
+def attribute_matches(actual, op, expected):
+    """Check one attribute value against a CSS attribute operator"""
+    if actual is None:
+        return False
+    if op is None:
+        return True
+    if op == '=':
+        return actual == expected
+    if op == '*=':
+        return bool(expected) and expected in actual
+    if op == '^=':
+        return bool(expected) and actual.startswith(expected)
+    if op == '$=':
+        return bool(expected) and actual.endswith(expected)
+    if op == '~=':
+        return expected in actual.split()
+    if op == '|=':
+        return actual == expected or actual.startswith(expected + '-')
+    return False
+
+class SelectorMatcher(HTMLParser):
+    """Count elements matching a set of compiled selectors in a single parse"""
+    
+    def __init__(self, selectors):
+        super().__init__(convert_charrefs=True)
+        self.selectors = selectors
+        self.counts = {selector: 0 for selector in selectors}
+    
+    def handle_starttag(self, tag, attrs):
+        attributes = {name: (value if value is not None else '') for name, value in attrs}
+        for selector, (wanted_tag, conditions) in self.selectors.items():
+            if wanted_tag is not None and wanted_tag != tag:
+                continue
+            if all(attribute_matches(attributes.get(name), op, value) for name, op, value in conditions):
+                self.counts[selector] += 1
+    
+    handle_startendtag = handle_starttag
+
+def load_fixture(source):
+    """Read a fixture from a local path or a fixture server URL"""
+    if source.startswith(('http://', 'https://')):
+        with urllib.request.urlopen(source, timeout=10) as response:
+            return response.read().decode('utf-8', errors='replace')
+    with open(source, 'r', encoding='utf-8', errors='replace') as file:
+        return file.read()
+
+def validate_tool_fixture(ai_name, source, config):
+    """Check one tool's selectors against its saved HTML snapshot"""
+    result = {'name': ai_name, 'source': source, 'matches': {}, 'unsupported': [], 'error': None}
+    try:
+        started = time.perf_counter()
+        html = load_fixture(source)
+        result['load_ms'] = (time.perf_counter() - started) * 1000
+    except Exception as e:
+        result['error'] = str(e)
+        return result
+    
+    selectors = {}
+    for key in ('selector', 'submit_selector'):
+        compiled = compile_selector(config[key])
+        if compiled is None:
+            result['unsupported'].append(key)
+        else:
+            selectors[config[key]] = compiled
+    
+    started = time.perf_counter()
+    matcher = SelectorMatcher(selectors)
+    matcher.feed(html)
+    matcher.close()
+    result['parse_ms'] = (time.perf_counter() - started) * 1000
+    
+    for key in ('selector', 'submit_selector'):
+        if key not in result['unsupported']:
+            result['matches'][key] = matcher.counts[config[key]]
+    result['ok'] = not result['unsupported'] and all(result['matches'].values())
+    return result
+
 class CustomHTTPRequestHandler(SimpleHTTPRequestHandler):
     """Custom HTTP handler with additional routes"""
     
@@ -23,26 +556,149 @@ class CustomHTTPRequestHandler(SimpleHTTPRequestHandler):
         super().__init__(*args, **kwargs)
     
     def do_GET(self):
-        if self.path == '/':
+        route = urlparse(self.path).path
+        if route == '/events':
+            # Long-lived streams are capped by the broadcaster, not queued
+            self.stream_events()
+            return
+        if route.startswith('/debug/'):
+            # Diagnostics must still answer when the server is saturated
+            self.route_request(route)
+            return
+        admission = self.checker.admission
+        retry_after = admission.check_rate(self.client_address[0], route)
+        if retry_after:
+            self.send_overloaded(429, retry_after)
+            return
+        if route == '/open-all':
+            # The launch leader takes the admission slot, so requests joining it never queue
+            self.route_request(route)
+            return
+        if not admission.acquire(route):
+            self.send_overloaded(503, admission.retry_after)
+            return
+        try:
+            self.route_request(route)
+        finally:
+            admission.release(route)
+    
+    def send_overloaded(self, status, retry_after):
+        """Reject a request quickly with a Retry-After hint"""
+        self.send_response(status)
+        self.send_header('Content-type', 'application/json')
+        self.send_header('Retry-After', str(retry_after))
+        self.end_headers()
+        self.wfile.write(json.dumps({'status': 'busy', 'retry_after': retry_after}).encode('utf-8'))
+    
+    def route_request(self, route):
+        """Dispatch an admitted request to its route"""
+        if route == '/':
             self.send_response(200)
             self.send_header('Content-type', 'text/html')
             self.end_headers()
-            self.wfile.write(self.checker.get_html().encode('utf-8'))
-        elif self.path == '/open-all':
+            html = self.checker.render_artifact('html', lambda snapshot: self.checker.get_html(snapshot=snapshot))
+            self.wfile.write(html.encode('utf-8'))
+        elif route == '/open-all':
+            try:
+                coalesced = self.checker.launch_all_tools()
+            except AdmissionRejected:
+                self.send_overloaded(503, self.checker.admission.retry_after)
+                return
             self.send_response(200)
             self.send_header('Content-type', 'application/json')
             self.end_headers()
-            self.checker.open_all_tools()
-            self.wfile.write(json.dumps({'status': 'success'}).encode('utf-8'))
-        elif self.path == '/get-injection-bookmarklet':
+            self.wfile.write(json.dumps({'status': 'success', 'coalesced': coalesced}).encode('utf-8'))
+        elif route == '/get-injection-bookmarklet':
             self.send_response(200)
             self.send_header('Content-type', 'application/json')
             self.end_headers()
-            bookmarklet = self.checker.generate_universal_bookmarklet()
+            bookmarklet = self.checker.render_artifact(
+                'bookmarklet', lambda snapshot: self.checker.generate_universal_bookmarklet(snapshot[1]))
             self.wfile.write(json.dumps({'bookmarklet': bookmarklet}).encode('utf-8'))
+        elif route == '/api/prompt':
+            params = parse_qs(urlparse(self.path).query)
+            since = self.checker.known_prompt_version(params.get('since', [''])[0], params.get('epoch', [''])[0])
+            update = self.checker.render_artifact(('prompt-update', since),
+                                                  lambda snapshot: self.checker.get_prompt_update(since, snapshot))
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.end_headers()
+            self.wfile.write(update.encode('utf-8'))
+        elif route.startswith('/debug/'):
+            self.handle_debug(route, parse_qs(urlparse(self.path).query))
         else:
             super().do_GET()
     
+    def handle_debug(self, route, params):
+        """Serve opt-in profiling and memory reports to local clients only"""
+        if not self.checker.debug_endpoints or self.client_address[0] not in ('127.0.0.1', '::1'):
+            self.send_error(404)
+            return
+        
+        if route == '/debug/profile':
+            try:
+                seconds = float(params.get('seconds', ['5'])[0])
+            except ValueError:
+                self.send_error(400, 'seconds must be a number')
+                return
+            report = self.checker.sample_profile(seconds)
+            self.send_response(200)
+            self.send_header('Content-type', 'text/plain; charset=utf-8')
+            self.end_headers()
+            self.wfile.write(report.encode('utf-8'))
+        elif route == '/debug/memory':
+            self.send_response(200)
+            self.send_header('Content-type', 'application/json')
+            self.end_headers()
+            report = self.checker.memory_report(stop=params.get('stop', ['0'])[0] == '1')
+            self.wfile.write(json.dumps(report, indent=2).encode('utf-8'))
+        else:
+            self.send_error(404)
+    
+    def stream_events(self):
+        """Push broadcaster events to the client as a Server-Sent Events stream"""
+        last_event_id = self.headers.get('Last-Event-ID')
+        broadcaster = self.checker.broadcaster
+        subscriber = broadcaster.subscribe(last_event_id)
+        if subscriber is None:
+            # 204 tells EventSource to stop reconnecting
+            self.send_response(204)
+            self.end_headers()
+            return
+        if last_event_id and broadcaster.parse_event_id(last_event_id) == 0:
+            # Reconnecting across a restart: the old history is gone, so hand over the current prompt
+            subscriber.put((None, 'prompt', json.dumps(self.checker.prompt_event())))
+        
+        self.send_response(200)
+        self.send_header('Content-type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'keep-alive')
+        self.end_headers()
+        self.checker.publish_metrics()
+        try:
+            self.wfile.write(b'retry: 3000\n\n')
+            self.wfile.flush()
+            while True:
+                try:
+                    message = subscriber.get(timeout=self.checker.heartbeat_interval)
+                except queue.Empty:
+                    self.wfile.write(b': heartbeat\n\n')
+                    self.wfile.flush()
+                    continue
+                if message is None:
+                    break
+                event_id, event, data = message
+                payload = 'event: %s\ndata: %s\n\n' % (event, data)
+                if event_id is not None:
+                    payload = 'id: %s\n' % broadcaster.format_event_id(event_id) + payload
+                self.wfile.write(payload.encode('utf-8'))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            broadcaster.unsubscribe(subscriber)
+            self.checker.publish_metrics()
+    
     def log_message(self, format, *args):
         """Suppress log messages"""
         pass
@@ -112,17 +768,61 @@ class EnhancedAIChecker:
             }
         }
         
-        self.prompt = ""
+        # (version, prompt) replaced in one assignment so request threads never see a torn pair
+        self.prompt_snapshot = (0, "")
+        # Versions whose text is kept in the artifact cache (and its budget) for deltas
+        self.prompt_history = deque(maxlen=10)
+        self.prompt_mtime = None
         self.server_port = 8080
         self.opened_tabs = []
         self.server = None
         self.server_thread = None
-        
+        self.watcher_thread = None
+        self.broadcaster = EventBroadcaster()
+        self.heartbeat_interval = 15
+        self.metrics_interval = 1
+        self.metrics_lock = threading.Lock()
+        self.metrics_timer = None
+        self.last_metrics = 0
+        self.insert_chunk_size = 64 * 1024
+        self.single_flight = SingleFlight()
+        self.artifact_cache = ArtifactCache()
+        self.share_escaped_strings = True
+        self.launch_coalesce_window = 10
+        self.debug_endpoints = False
+        self.admission = AdmissionController()
+        self.chunked_insert_threshold = 256 * 1024
+        
+    @property
+    def prompt(self):
+        """Current prompt text"""
+        return self.prompt_snapshot[1]
+    
+    @property
+    def prompt_version(self):
+        """Version number of the current prompt"""
+        return self.prompt_snapshot[0]
+    
+    def set_prompt(self, snapshot):
+        """Publish a new (version, prompt) snapshot and remember its text for deltas"""
+        if len(self.prompt_history) == self.prompt_history.maxlen:
+            self.artifact_cache.discard(('prompt-text', self.prompt_history[0]))
+        self.prompt_history.append(snapshot[0])
+        self.artifact_cache.put(('prompt-text', snapshot[0]), snapshot[1])
+        self.prompt_snapshot = snapshot
+    
+    def previous_prompt(self, version):
+        """Text of a remembered prompt version, or None if forgotten or evicted"""
+        if version not in self.prompt_history:
+            return None
+        return self.artifact_cache.get(('prompt-text', version))
+    
     def read_prompt(self):
         """Read prompt from abc.txt file"""
         try:
             with open('abc.txt', 'r', encoding='utf-8') as file:
-                self.prompt = file.read().strip()
+                self.prompt_mtime = os.fstat(file.fileno()).st_mtime
+                self.set_prompt((self.prompt_version + 1, file.read().strip()))
                 print(f"✅ Prompt loaded: {self.prompt[:50]}...")
                 return True
         except FileNotFoundError:
@@ -133,6 +833,91 @@ class EnhancedAIChecker:
             print(f"❌ Error reading abc.txt: {e}")
             return False
     
+    def watch_prompt(self, interval=1):
+        """Reload abc.txt when it changes and push the new version to dashboards"""
+        while True:
+            time.sleep(interval)
+            try:
+                mtime = os.stat('abc.txt').st_mtime
+            except OSError:
+                continue
+            if mtime != self.prompt_mtime and self.read_prompt():
+                self.broadcaster.publish('prompt', self.prompt_event())
+                self.prepare_prompt_updates()
+                self.publish_metrics()
+    
+    def prompt_event(self):
+        """Payload of the prompt event announcing the current version"""
+        version, prompt = self.prompt_snapshot
+        return {'epoch': self.broadcaster.epoch, 'version': version, 'length': utf16_length(prompt)}
+    
+    def prepare_prompt_updates(self):
+        """Build the update from every remembered version once per change, off the request path"""
+        for since in list(self.prompt_history):
+            self.render_artifact(('prompt-update', since),
+                                 lambda snapshot, since=since: self.get_prompt_update(since, snapshot))
+    
+    def known_prompt_version(self, since, epoch=None):
+        """Parse a client's since parameter, mapping versions whose text is no longer kept to None
+        
+        When epoch is given it must match this process, since versions restart
+        from 1 after a restart and would otherwise name unrelated texts.
+        """
+        if epoch is not None and epoch != self.broadcaster.epoch:
+            return None
+        try:
+            since = int(since)
+        except ValueError:
+            return None
+        return since if self.previous_prompt(since) is not None else None
+    
+    def get_prompt_update(self, since, snapshot=None):
+        """JSON update bringing a client from prompt version since to the current one
+        
+        Sends a line delta when the client's version text is still remembered
+        and the delta is smaller than the full prompt, otherwise the full text
+        (also when since is None).
+        """
+        version, prompt = snapshot or self.prompt_snapshot
+        epoch = self.broadcaster.epoch
+        full = json.dumps({'epoch': epoch, 'version': version, 'prompt': prompt})
+        if since is None:
+            return full
+        if since == version:
+            return json.dumps({'epoch': epoch, 'version': version, 'unchanged': True})
+        
+        base = self.previous_prompt(since)
+        if base is None:
+            return full
+        delta = json.dumps({'epoch': epoch, 'version': version, 'since': since, 'length': utf16_length(prompt),
+                            'ops': prompt_delta(base, prompt)})
+        return delta if len(delta) < len(full) else full
+    
+    def publish_metrics(self):
+        """Push current server metrics to dashboards, at most once per metrics_interval
+        
+        Calls made while a push is already scheduled are coalesced into it.
+        """
+        with self.metrics_lock:
+            if self.metrics_timer is not None:
+                return
+            delay = max(0, self.last_metrics + self.metrics_interval - time.monotonic())
+            self.metrics_timer = threading.Timer(delay, self.send_metrics)
+            self.metrics_timer.daemon = True
+            self.metrics_timer.start()
+    
+    def send_metrics(self):
+        """Publish the current metrics snapshot (not kept in the replay history)"""
+        with self.metrics_lock:
+            self.metrics_timer = None
+            self.last_metrics = time.monotonic()
+        self.broadcaster.publish('metrics', {
+            'viewers': self.broadcaster.subscriber_count(),
+            'opened_tabs': len(self.opened_tabs),
+            'prompt_version': self.prompt_version,
+            'admission': self.admission.stats()
+        }, replay=False)
+    
     def create_sample_prompt(self):
         """Create sample abc.txt"""
         sample = """Write a Python script to upload APK files to AWS S3 bucket with proper error handling and progress tracking. Include features like:
@@ -147,7 +932,19 @@ class EnhancedAIChecker:
         print("✅ Created sample abc.txt")
     
     def escape_string_for_js(self, text):
-        """Properly escape string for JavaScript"""
+        """Properly escape string for JavaScript
+        
+        With share_escaped_strings the result is cached under a digest of the
+        source text, so every artifact built from an identical prompt reuses
+        one string without the cache also holding the source.
+        """
+        if self.share_escaped_strings:
+            key = ('escaped', hashlib.sha256(text.encode('utf-8')).digest(), len(text))
+            return self.artifact_cache.get_or_build(key, lambda: self._escape_js(text))
+        return self._escape_js(text)
+    
+    def _escape_js(self, text):
+        """Escape quotes, backslashes and control whitespace for a JS string literal"""
         return (text.replace('\\', '\\\\')
                    .replace('"', '\\"')
                    .replace("'", "\\'")
@@ -155,6 +952,71 @@ class EnhancedAIChecker:
                    .replace('\r', '\\r')
                    .replace('\t', '\\t'))
     
+    def get_insertion_routine(self, separator='\n'):
+        """Get the shared JavaScript routine that writes a prompt into a page element
+        
+        Text inputs get a single write through the native value setter,
+        contenteditable targets use insertText (falling back to one text node),
+        and very large prompts are appended in requestAnimationFrame slices so
+        the page stays responsive. Lines carry no comments so they can be
+        joined without newlines for bookmarklets.
+        """
+        chunk_size = str(self.insert_chunk_size)
+        routine_parts = [
+            "function insertPromptText(el, text, onDone) {",
+            "    const start = performance.now();",
+            "    const report = function(method, chunks) {",
+            "        const result = { method: method, chars: text.length, chunks: chunks, ms: Math.round(performance.now() - start) };",
+            "        console.log('⏱️ Prompt inserted via ' + method + ': ' + result.chars + ' chars in ' + result.ms + 'ms');",
+            "        if (onDone) { onDone(result); }",
+            "    };",
+            "    el.focus();",
+            "    if (el.tagName === 'TEXTAREA' || el.tagName === 'INPUT') {",
+            "        const proto = el.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;",
+            "        Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, text);",
+            "        el.dispatchEvent(new Event('input', { bubbles: true }));",
+            "        el.dispatchEvent(new Event('change', { bubbles: true }));",
+            "        report('value', 1);",
+            "        return;",
+            "    }",
+            "    if (text.length <= " + str(self.chunked_insert_threshold) + ") {",
+            "        const range = document.createRange();",
+            "        range.selectNodeContents(el);",
+            "        const selection = window.getSelection();",
+            "        selection.removeAllRanges();",
+            "        selection.addRange(range);",
+            "        if (document.execCommand('insertText', false, text)) {",
+            "            report('insertText', 1);",
+            "            return;",
+            "        }",
+            "        el.replaceChildren(document.createTextNode(text));",
+            "        el.dispatchEvent(new InputEvent('input', { bubbles: true, inputType: 'insertText', data: text }));",
+            "        report('textNode', 1);",
+            "        return;",
+            "    }",
+            "    const node = document.createTextNode('');",
+            "    el.replaceChildren(node);",
+            "    let offset = 0;",
+            "    let chunks = 0;",
+            "    const step = function() {",
+            "        node.appendData(text.slice(offset, offset + " + chunk_size + "));",
+            "        offset += " + chunk_size + ";",
+            "        chunks++;",
+            "        if (offset < text.length) {",
+            "            requestAnimationFrame(step);",
+            "            return;",
+            "        }",
+            "        el.dispatchEvent(new InputEvent('input', { bubbles: true, inputType: 'insertText' }));",
+            "        report('chunked', chunks);",
+            "    };",
+            "    requestAnimationFrame(step);",
+            "}"
+        ]
+        
+        if separator != '\n':
+            routine_parts = [part.strip() for part in routine_parts]
+        return separator.join(routine_parts)
+    
     def generate_injection_script(self, ai_name, config):
         """Generate JavaScript injection script for specific AI"""
         escaped_prompt = self.escape_string_for_js(self.prompt)
@@ -162,6 +1024,7 @@ class EnhancedAIChecker:
         
         script_parts = [
             "// Auto-prompt injection for " + ai_name,
+            self.get_insertion_routine(),
             "function injectPrompt_" + safe_name + "() {",
             "    console.log('🚀 Injecting prompt into " + ai_name + "...');",
             "    setTimeout(() => {",
@@ -173,21 +1036,11 @@ class EnhancedAIChecker:
             "                          document.querySelector('input[type=\"text\"]');",
             "            }",
             "            if (textArea) {",
-            "                textArea.value = '';",
-            "                textArea.textContent = '';",
-            "                if (textArea.tagName === 'TEXTAREA' || textArea.tagName === 'INPUT') {",
-            "                    textArea.value = \"" + escaped_prompt + "\";",
-            "                    textArea.dispatchEvent(new Event('input', { bubbles: true }));",
-            "                    textArea.dispatchEvent(new Event('change', { bubbles: true }));",
-            "                } else {",
-            "                    textArea.textContent = \"" + escaped_prompt + "\";",
-            "                    textArea.innerHTML = \"" + escaped_prompt + "\";",
-            "                    textArea.dispatchEvent(new Event('input', { bubbles: true }));",
-            "                }",
-            "                textArea.focus();",
-            "                textArea.dispatchEvent(new KeyboardEvent('keyup', { bubbles: true }));",
-            "                textArea.dispatchEvent(new KeyboardEvent('keydown', { bubbles: true }));",
-            "                console.log('✅ Prompt injected successfully into " + ai_name + "');",
+            "                insertPromptText(textArea, \"" + escaped_prompt + "\", () => {",
+            "                    textArea.dispatchEvent(new KeyboardEvent('keyup', { bubbles: true }));",
+            "                    textArea.dispatchEvent(new KeyboardEvent('keydown', { bubbles: true }));",
+            "                    console.log('✅ Prompt injected successfully into " + ai_name + "');",
+            "                });",
             "            } else {",
             "                console.warn('❌ Could not find text input for " + ai_name + "');",
             "            }",
@@ -201,11 +1054,12 @@ class EnhancedAIChecker:
         
         return '\n'.join(script_parts)
     
-    def generate_universal_bookmarklet(self):
+    def generate_universal_bookmarklet(self, prompt=None):
         """Generate a universal bookmarklet for prompt injection"""
-        escaped_prompt = self.escape_string_for_js(self.prompt)
+        escaped_prompt = self.escape_string_for_js(self.prompt if prompt is None else prompt)
         
         js_code = 'javascript:(function(){const prompt="' + escaped_prompt + '";'
+        js_code += self.get_insertion_routine(separator='')
         js_code += 'const selectors=['
         js_code += '\'textarea[placeholder*="Message"]\','
         js_code += '\'div[contenteditable="true"]\','
@@ -221,23 +1075,14 @@ class EnhancedAIChecker:
         js_code += 'for(const selector of selectors){'
         js_code += 'const el=document.querySelector(selector);'
         js_code += 'if(el){'
-        js_code += 'if(el.tagName==="TEXTAREA"||el.tagName==="INPUT"){'
-        js_code += 'el.value=prompt;'
-        js_code += 'el.dispatchEvent(new Event("input",{bubbles:true}));'
-        js_code += 'el.dispatchEvent(new Event("change",{bubbles:true}));'
-        js_code += '}else{'
-        js_code += 'el.textContent=prompt;'
-        js_code += 'el.innerHTML=prompt;'
-        js_code += 'el.dispatchEvent(new Event("input",{bubbles:true}));'
-        js_code += '}'
-        js_code += 'el.focus();'
+        js_code += 'insertPromptText(el,prompt,function(r){'
+        js_code += 'alert("✅ Prompt injected successfully! ("+r.ms+"ms via "+r.method+")");'
+        js_code += '});'
         js_code += 'found=true;'
         js_code += 'break;'
         js_code += '}'
         js_code += '}'
-        js_code += 'if(found){'
-        js_code += 'alert("✅ Prompt injected successfully!");'
-        js_code += '}else{'
+        js_code += 'if(!found){'
         js_code += 'alert("❌ Could not find text input field");'
         js_code += '}'
         js_code += '})();'
@@ -265,15 +1110,280 @@ class EnhancedAIChecker:
     def open_all_tools(self):
         """Open all AI tools"""
         print("🚀 Opening all AI tools...")
+        total = len(self.ai_tools)
+        self.broadcaster.publish('launch', {'status': 'started', 'opened': 0, 'total': total})
         
-        for name, config in self.ai_tools.items():
+        for index, (name, config) in enumerate(self.ai_tools.items(), 1):
             self.open_ai_with_prompt(name, config)
+            self.broadcaster.publish('launch', {
+                'status': 'progress',
+                'tool': name,
+                'opened': index,
+                'total': total
+            })
             time.sleep(1)  # Stagger opening to prevent browser overload
         
+        self.broadcaster.publish('launch', {'status': 'done', 'opened': total, 'total': total})
+        self.publish_metrics()
         print("✅ All tools opened!")
         print("💡 Use the bookmarklet or browser console to inject prompts")
         print("🔧 Manual submission required for safety")
     
+    def validate_selectors(self, fixtures='fixtures', workers=None, use_processes=True):
+        """Validate every tool's selectors against saved HTML snapshots
+        
+        fixtures is a directory or a fixture server base URL holding one
+        <Tool_Name>.html snapshot per tool. Loading and parsing run in a
+        worker pool so large registries validate in parallel.
+        """
+        print(f"🔍 Validating selectors for {len(self.ai_tools)} tools against {fixtures}...")
+        started = time.perf_counter()
+        
+        jobs = []
+        for name, config in self.ai_tools.items():
+            file_name = name.replace('.', '_').replace(' ', '_') + '.html'
+            if fixtures.startswith(('http://', 'https://')):
+                source = fixtures.rstrip('/') + '/' + quote(file_name)
+            else:
+                source = os.path.join(fixtures, file_name)
+            jobs.append((name, source, config))
+        
+        pool_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        chunk_size = max(1, len(jobs) // ((os.cpu_count() or 1) * 4))
+        with pool_class(max_workers=workers) as pool:
+            results = list(pool.map(validate_tool_fixture, *zip(*jobs), chunksize=chunk_size)) if jobs else []
+        
+        for result in results:
+            if result['error']:
+                print(f"  ⚠️  {result['name']}: no fixture ({result['error']})")
+                continue
+            status = '✅' if result['ok'] else '❌'
+            matches = ', '.join(f"{key}={count}" for key, count in result['matches'].items())
+            unsupported = ''.join(f", {key}=unsupported" for key in result['unsupported'])
+            print(f"  {status} {result['name']}: {matches}{unsupported} • parsed in {result['parse_ms']:.1f}ms")
+        
+        passed = sum(1 for result in results if result.get('ok'))
+        elapsed = time.perf_counter() - started
+        print(f"📊 {passed}/{len(results)} tools matched all selectors in {elapsed:.2f}s")
+        return results
+    
+    def render_artifact(self, name, builder):
+        """Get an artifact for the current prompt version from the cache, sharing builds between concurrent requests
+        
+        builder is called with the (version, prompt) snapshot the key was made from.
+        """
+        snapshot = self.prompt_snapshot
+        key = (name, snapshot[0])
+        result, _ = self.single_flight.do(key, lambda: self.artifact_cache.get_or_build(key, lambda: builder(snapshot)))
+        return result
+    
+    def launch_all_tools(self):
+        """Open all tools, coalescing duplicate launches within launch_coalesce_window seconds
+        
+        Returns True when the request joined an existing launch. Only the
+        leader takes an /open-all admission slot; AdmissionRejected is raised
+        to it and every joined caller when the slot cannot be had.
+        """
+        def launch():
+            if not self.admission.acquire('/open-all'):
+                raise AdmissionRejected('/open-all')
+            try:
+                return self.open_all_tools()
+            finally:
+                self.admission.release('/open-all')
+        
+        _, coalesced = self.single_flight.do('open-all', launch, linger=self.launch_coalesce_window)
+        if coalesced:
+            print("♻️  Launch already in progress, request coalesced")
+        return coalesced
+    
+    def sample_profile(self, seconds, interval=0.005, limit=25):
+        """Sample the stacks of threads busy handling requests for a few seconds and report the hottest functions
+        
+        Only stacks running inside route_request are counted, and only up to
+        that frame, so idle workers, event streams and the serve loop do not
+        drown out the handlers.
+        """
+        seconds = max(0.1, min(seconds, 60))
+        own_thread = threading.get_ident()
+        handler_code = CustomHTTPRequestHandler.route_request.__code__
+        self_counts = Counter()
+        total_counts = Counter()
+        samples = 0
+        busy_samples = 0
+        deadline = time.monotonic() + seconds
+        
+        while time.monotonic() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread:
+                    continue
+                stack = []
+                while frame is not None and frame.f_code is not handler_code:
+                    stack.append(frame.f_code)
+                    frame = frame.f_back
+                if frame is None:
+                    continue
+                stack.append(handler_code)
+                busy_samples += 1
+                seen = set()
+                for depth, code in enumerate(stack):
+                    location = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                    if depth == 0:
+                        self_counts[location] += 1
+                    if location not in seen:
+                        total_counts[location] += 1
+                        seen.add(location)
+            samples += 1
+            time.sleep(interval)
+        
+        lines = [f"Sampled {samples} times over {seconds:.1f}s ({busy_samples} busy request stacks)", ""]
+        lines.append("Top functions by self samples:")
+        for location, count in self_counts.most_common(limit):
+            lines.append(f"  {count:6d}  {location}")
+        lines.append("")
+        lines.append("Top functions by inclusive samples:")
+        for location, count in total_counts.most_common(limit):
+            lines.append(f"  {count:6d}  {location}")
+        return '\n'.join(lines) + '\n'
+    
+    def memory_report(self, limit=20, stop=False):
+        """Report top allocations and the size of the checker's in-memory artifacts
+        
+        The first request starts tracemalloc; stop=True takes a final snapshot
+        and turns tracing off again so allocations run at full speed.
+        """
+        report = {'tracing': tracemalloc.is_tracing()}
+        if not report['tracing']:
+            if stop:
+                report['note'] = 'tracemalloc is not running'
+            else:
+                tracemalloc.start()
+                report['tracing'] = True
+                report['note'] = 'tracemalloc started; request again for allocation statistics, add ?stop=1 to stop'
+        else:
+            snapshot = tracemalloc.take_snapshot()
+            report['top_allocations'] = [
+                {'location': str(stat.traceback), 'size_bytes': stat.size, 'count': stat.count}
+                for stat in snapshot.statistics('lineno')[:limit]
+            ]
+            current, peak = tracemalloc.get_traced_memory()
+            report['traced_bytes'] = current
+            report['peak_traced_bytes'] = peak
+            if stop:
+                tracemalloc.stop()
+                report['tracing'] = False
+                report['note'] = 'tracemalloc stopped'
+        
+        entry_sizes = {}
+        bytes_by_name = Counter()
+        for key, size in self.artifact_cache.entry_sizes():
+            parts = []
+            for part in key:
+                parts.extend(part if isinstance(part, tuple) else (part,))
+            label = ':'.join(part.hex()[:12] if isinstance(part, bytes) else str(part) for part in parts)
+            entry_sizes[label] = size
+            bytes_by_name[str(parts[0])] += size
+        report['artifacts'] = {
+            'prompt_bytes': sys.getsizeof(self.prompt),
+            'artifact_bytes_by_name': dict(bytes_by_name),
+            'artifact_entries': entry_sizes,
+            'artifact_cache': self.artifact_cache.stats(),
+            'opened_tabs_count': len(self.opened_tabs),
+            'opened_tabs_bytes': deep_sizeof(self.opened_tabs),
+            'event_history_bytes': deep_sizeof(list(self.broadcaster.history))
+        }
+        return report
+    
+    def export_static(self, prompts='prompts', output='dist', workers=None):
+        """Export dashboards for a set of prompts as a static, precompressed site
+        
+        prompts is a directory of .txt prompt files or a single prompt file.
+        Pages are rendered in a process pool; prompts whose text and build
+        inputs match the previous manifest are skipped entirely.
+        """
+        if not os.path.exists(prompts):
+            print(f"❌ Prompts not found: {prompts}")
+            return None
+        if os.path.isdir(prompts):
+            prompt_files = sorted(os.path.join(prompts, name) for name in os.listdir(prompts) if name.endswith('.txt'))
+        else:
+            prompt_files = [prompts]
+        print(f"📦 Exporting {len(prompt_files)} prompts to {output}...")
+        started = time.perf_counter()
+        
+        manifest_path = os.path.join(output, 'manifest.json')
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as file:
+                previous = json.load(file)
+        except (FileNotFoundError, ValueError):
+            previous = {}
+        
+        css = self.get_css()
+        js = self.get_javascript()
+        assets = {'css': 'assets/' + fingerprint_name('app.css', css), 'js': 'assets/' + fingerprint_name('app.js', js)}
+        write_static_file(output, assets['css'], css)
+        write_static_file(output, assets['js'], js)
+        
+        with open(os.path.abspath(__file__), 'rb') as file:
+            build_hash = hashlib.sha256(file.read())
+        build_hash.update(json.dumps(self.ai_tools, sort_keys=True).encode('utf-8'))
+        build_key = build_hash.hexdigest()
+        reuse = previous.get('build_key') == build_key
+        
+        manifest = {'build_key': build_key, 'assets': assets, 'prompts': {}}
+        jobs = []
+        for path in prompt_files:
+            slug = os.path.splitext(os.path.basename(path))[0].replace(' ', '_')
+            with open(path, 'r', encoding='utf-8') as file:
+                prompt = file.read().strip()
+            source_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+            entry = previous.get('prompts', {}).get(slug)
+            if (reuse and entry and entry['source_hash'] == source_hash
+                    and all(os.path.exists(os.path.join(output, p)) for p in entry['files'].values())):
+                manifest['prompts'][slug] = entry
+                continue
+            manifest['prompts'][slug] = {'source_hash': source_hash}
+            jobs.append((slug, prompt))
+        
+        written = 0
+        if jobs:
+            chunk_size = max(1, len(jobs) // ((os.cpu_count() or 1) * 4))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = pool.map(render_static_prompt, *zip(*jobs),
+                                   *zip(*[(self.ai_tools, assets, output)] * len(jobs)),
+                                   chunksize=chunk_size)
+                for slug, files, count in results:
+                    manifest['prompts'][slug]['files'] = files
+                    written += count
+        
+        # Drop outputs from the previous build that are no longer referenced
+        current = set(assets.values())
+        for entry in manifest['prompts'].values():
+            current.update(entry['files'].values())
+        stale = set(previous.get('assets', {}).values())
+        for entry in previous.get('prompts', {}).values():
+            stale.update(entry.get('files', {}).values())
+        for relative_path in stale - current:
+            for path in (os.path.join(output, relative_path), os.path.join(output, relative_path) + '.gz'):
+                if os.path.exists(path):
+                    os.remove(path)
+            # Also remove the directories this leaves empty, such as prompts/<slug>/inject/
+            directory = os.path.dirname(relative_path)
+            while directory:
+                try:
+                    os.rmdir(os.path.join(output, directory))
+                except OSError:
+                    break
+                directory = os.path.dirname(directory)
+        
+        with open(manifest_path, 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, indent=2, sort_keys=True)
+        
+        elapsed = time.perf_counter() - started
+        print(f"✅ Rendered {len(jobs)} prompts ({len(prompt_files) - len(jobs)} unchanged), "
+              f"wrote {written} files in {elapsed:.2f}s")
+        return manifest
+    
     def get_enhanced_cards(self):
         """Generate enhanced AI cards HTML"""
         cards_html = ""
@@ -288,11 +1398,18 @@ class EnhancedAIChecker:
             cards_html += card_template % (name, config['wait_time'], config['url'], name)
         return cards_html
     
-    def get_html(self):
-        """Generate the HTML for the dashboard"""
-        prompt_display = self.prompt.replace('<', '&lt;').replace('>', '&gt;')
+    def get_html(self, static_assets=None, snapshot=None):
+        """Generate the HTML for the dashboard
+        
+        static_assets maps 'css', 'js' and 'bookmarklet' to file URLs for the
+        static export; by default styles and scripts are inlined and the page
+        talks to the live server routes. snapshot is the (version, prompt)
+        pair to render, defaulting to the current one.
+        """
+        version, prompt = snapshot or self.prompt_snapshot
+        prompt_display = prompt.replace('<', '&lt;').replace('>', '&gt;')
         cards_html = self.get_enhanced_cards()
-        prompt_js = self.escape_string_for_js(self.prompt)
+        prompt_js = self.escape_string_for_js(prompt)
         
         # Build HTML in parts to avoid triple quote issues
         html_parts = []
@@ -302,9 +1419,12 @@ class EnhancedAIChecker:
         html_parts.append('<html>')
         html_parts.append('<head>')
         html_parts.append('<title>Enhanced AI Command Center</title>')
-        html_parts.append('<style>')
-        html_parts.append(self.get_css())
-        html_parts.append('</style>')
+        if static_assets:
+            html_parts.append('<link rel="stylesheet" href="' + static_assets['css'] + '">')
+        else:
+            html_parts.append('<style>')
+            html_parts.append(self.get_css())
+            html_parts.append('</style>')
         html_parts.append('</head>')
         html_parts.append('<body>')
         
@@ -328,7 +1448,8 @@ class EnhancedAIChecker:
         
         html_parts.append('<div class="prompt-display">')
         html_parts.append('<h3 style="color: #00ffff; margin-bottom: 15px;">📡 ACTIVE PROMPT TRANSMISSION:</h3>')
-        html_parts.append('<div class="terminal-text">' + prompt_display + '</div>')
+        html_parts.append('<div class="terminal-text" id="promptDisplay">' + prompt_display + '</div>')
+        html_parts.append('<div class="live-status" id="liveStatus">📶 Connecting to live updates...</div>')
         html_parts.append('</div>')
         
         html_parts.append('<div class="control-center">')
@@ -353,8 +1474,21 @@ class EnhancedAIChecker:
         
         # JavaScript
         html_parts.append('<script>')
-        html_parts.append('const promptText = `' + prompt_js + '`;')
-        html_parts.append(self.get_javascript())
+        html_parts.append('let promptText = `' + prompt_js + '`;')
+        html_parts.append('let promptVersion = ' + str(version) + ';')
+        html_parts.append('let promptEpoch = ' + json.dumps(self.broadcaster.epoch) + ';')
+        if static_assets:
+            dashboard_config = {'launchUrl': None, 'bookmarkletUrl': static_assets['bookmarklet'], 'promptUrl': None,
+                                'liveUpdates': False}
+        else:
+            dashboard_config = {'launchUrl': '/open-all', 'bookmarkletUrl': '/get-injection-bookmarklet', 'promptUrl': '/api/prompt',
+                                'liveUpdates': True}
+        html_parts.append('const dashboardConfig = ' + json.dumps(dashboard_config) + ';')
+        if static_assets:
+            html_parts.append('</script>')
+            html_parts.append('<script src="' + static_assets['js'] + '">')
+        else:
+            html_parts.append(self.get_javascript())
         html_parts.append('</script>')
         
         html_parts.append('</body>')
@@ -653,6 +1787,12 @@ class EnhancedAIChecker:
             box-shadow: 0 5px 15px rgba(255, 255, 0, 0.4);
         }
         
+        .live-status {
+            margin-top: 10px;
+            font-size: 0.9em;
+            color: #888;
+        }
+        
         .notification {
             position: fixed;
             top: 20px;
@@ -698,10 +1838,23 @@ class EnhancedAIChecker:
             btn.innerHTML = '🚀 Launching Systems...';
             btn.disabled = true;
             
-            fetch('/open-all')
-                .then(response => response.json())
+            if (!dashboardConfig.launchUrl) {
+                document.querySelectorAll('.ai-link').forEach(link => window.open(link.href, '_blank'));
+                showCyberNotification('🚀 All AI systems opened! Use the bookmarklet to inject prompts.');
+                btn.innerHTML = originalText;
+                btn.disabled = false;
+                return;
+            }
+            
+            fetch(dashboardConfig.launchUrl)
+                .then(response => {
+                    if (!response.ok) {
+                        throw new Error('Server busy, retry in ' + response.headers.get('Retry-After') + 's');
+                    }
+                    return response.json();
+                })
                 .then(data => {
-                    btn.innerHTML = '✅ Systems Launched!';
+                    btn.innerHTML = data.coalesced ? '♻️ Already Launched!' : '✅ Systems Launched!';
                     btn.style.background = 'linear-gradient(45deg, #00ff00, #80ff00)';
                     btn.style.color = '#000';
                     
@@ -716,6 +1869,7 @@ class EnhancedAIChecker:
                 })
                 .catch(error => {
                     console.error('Error:', error);
+                    showCyberNotification('❌ ' + error.message);
                     btn.innerHTML = '❌ Launch Failed';
                     setTimeout(() => {
                         btn.innerHTML = originalText;
@@ -747,7 +1901,7 @@ class EnhancedAIChecker:
         }
         
         function generateBookmarklet() {
-            fetch('/get-injection-bookmarklet')
+            fetch(dashboardConfig.bookmarkletUrl)
                 .then(response => response.json())
                 .then(data => {
                     const bookmarkletSection = document.getElementById('bookmarkletSection');
@@ -780,6 +1934,104 @@ class EnhancedAIChecker:
                 }, 500);
             }, 5000);
         }
+        
+        function applyPromptDelta(base, ops) {
+            const lines = base.match(/[^\\n]*\\n|[^\\n]+$/g) || [];
+            const parts = [];
+            let index = 0;
+            for (const op of ops) {
+                if (op[0] === '=') {
+                    for (let i = 0; i < op[1]; i++) {
+                        parts.push(lines[index++]);
+                    }
+                } else if (op[0] === '-') {
+                    index += op[1];
+                } else {
+                    parts.push(op[1]);
+                }
+            }
+            return parts.join('');
+        }
+        
+        function isNewPrompt(update) {
+            // Versions restart after a server restart, so any version from another epoch is new
+            return update.epoch !== promptEpoch || update.version > promptVersion;
+        }
+        
+        function fetchPromptUpdate() {
+            return fetch(dashboardConfig.promptUrl + '?since=' + promptVersion + '&epoch=' + encodeURIComponent(promptEpoch))
+                .then(response => response.json())
+                .then(update => {
+                    if (update.unchanged) {
+                        return null;
+                    }
+                    if (!update.ops) {
+                        return update;
+                    }
+                    const text = applyPromptDelta(promptText, update.ops);
+                    if (text.length === update.length) {
+                        return { epoch: update.epoch, version: update.version, prompt: text };
+                    }
+                    return fetch(dashboardConfig.promptUrl).then(response => response.json());
+                });
+        }
+        
+        function connectLiveUpdates() {
+            const liveStatus = document.getElementById('liveStatus');
+            if (!dashboardConfig.liveUpdates || !window.EventSource) {
+                liveStatus.style.display = 'none';
+                return;
+            }
+            const source = new EventSource('/events');
+            
+            source.onopen = () => {
+                liveStatus.textContent = '📶 Live updates connected';
+            };
+            
+            source.onerror = () => {
+                if (source.readyState === EventSource.CLOSED) {
+                    liveStatus.textContent = '⚠️ Live updates unavailable (server at capacity)';
+                } else {
+                    liveStatus.textContent = '⚠️ Live updates lost, reconnecting...';
+                }
+            };
+            
+            source.addEventListener('prompt', event => {
+                const data = JSON.parse(event.data);
+                if (!isNewPrompt(data)) {
+                    return;
+                }
+                fetchPromptUpdate()
+                    .then(update => {
+                        if (!update || !isNewPrompt(update)) {
+                            return;
+                        }
+                        promptEpoch = update.epoch;
+                        promptVersion = update.version;
+                        promptText = update.prompt;
+                        document.getElementById('promptDisplay').textContent = promptText;
+                        document.getElementById('bookmarkletSection').style.display = 'none';
+                        showCyberNotification('📡 Prompt updated to version ' + promptVersion);
+                    })
+                    .catch(error => console.error('Error:', error));
+            });
+            
+            source.addEventListener('launch', event => {
+                const data = JSON.parse(event.data);
+                if (data.status === 'progress') {
+                    liveStatus.textContent = '🚀 Launching ' + data.tool + ' (' + data.opened + '/' + data.total + ')';
+                } else if (data.status === 'done') {
+                    liveStatus.textContent = '✅ Launched ' + data.total + ' AI systems';
+                }
+            });
+            
+            source.addEventListener('metrics', event => {
+                const data = JSON.parse(event.data);
+                liveStatus.title = data.viewers + ' viewers • ' + data.opened_tabs + ' tabs opened • prompt v' + data.prompt_version;
+            });
+        }
+        
+        connectLiveUpdates();
         '''
         return js
     
@@ -789,7 +2041,8 @@ class EnhancedAIChecker:
             # Create a custom handler factory that includes the checker instance
             handler = partial(CustomHTTPRequestHandler, checker_instance=self)
             
-            self.server = HTTPServer(('localhost', self.server_port), handler)
+            self.server = ThreadingHTTPServer(('localhost', self.server_port), handler)
+            self.server.daemon_threads = True
             print(f"✅ Server started at http://localhost:{self.server_port}")
             
             # Open browser
@@ -800,6 +2053,11 @@ class EnhancedAIChecker:
             self.server_thread.daemon = True
             self.server_thread.start()
             
+            # Watch abc.txt so open dashboards pick up prompt edits
+            self.watcher_thread = threading.Thread(target=self.watch_prompt)
+            self.watcher_thread.daemon = True
+            self.watcher_thread.start()
+            
             print("🌐 Dashboard opened in browser")
             print("⌨️  Press Ctrl+C to stop the server")
             
@@ -809,6 +2067,7 @@ class EnhancedAIChecker:
                 
         except KeyboardInterrupt:
             print("\n🛑 Shutting down server...")
+            self.broadcaster.close()
             if self.server:
                 self.server.shutdown()
             print("✅ Server stopped")
@@ -828,9 +2087,11 @@ class EnhancedAIChecker:
         print("\n📊 Dashboard Options:")
         print("1. Open web dashboard (recommended)")
         print("2. Open all AI tools directly")
-        print("3. Exit")
+        print("3. Validate selectors against saved HTML fixtures")
+        print("4. Export static dashboard site")
+        print("5. Exit")
         
-        choice = input("\nSelect option (1-3): ").strip()
+        choice = input("\nSelect option (1-5): ").strip()
         
         if choice == '1':
             self.start_server()
@@ -839,6 +2100,12 @@ class EnhancedAIChecker:
             print("\n✅ All AI tools opened!")
             print("💡 Use the generated bookmarklet to inject prompts")
         elif choice == '3':
+            fixtures = input("Fixtures directory or URL [fixtures]: ").strip()
+            self.validate_selectors(fixtures or 'fixtures')
+        elif choice == '4':
+            prompts = input("Prompts directory or file [abc.txt]: ").strip()
+            self.export_static(prompts or 'abc.txt')
+        elif choice == '5':
             print("👋 Exiting...")
         else:
             print("❌ Invalid choice")
@@ -846,6 +2113,21 @@ class EnhancedAIChecker:
 def main():
     """Main entry point"""
     checker = EnhancedAIChecker()
+    if '--debug' in sys.argv:
+        sys.argv.remove('--debug')
+        checker.debug_endpoints = True
+        print("🩺 Debug endpoints enabled at /debug/profile and /debug/memory (local clients only)")
+    if '--cache-mb' in sys.argv:
+        index = sys.argv.index('--cache-mb')
+        checker.artifact_cache.max_bytes = int(float(sys.argv[index + 1]) * 1024 * 1024)
+        del sys.argv[index:index + 2]
+    if len(sys.argv) > 1 and sys.argv[1] == 'validate':
+        checker.validate_selectors(sys.argv[2] if len(sys.argv) > 2 else 'fixtures')
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == 'export':
+        checker.export_static(sys.argv[2] if len(sys.argv) > 2 else 'abc.txt',
+                              sys.argv[3] if len(sys.argv) > 3 else 'dist')
+        return
     checker.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,476 @@
+import io
+import json
+import shutil
+import subprocess
+import threading
+import time
+
+import pytest
+
+import aipromtsdata
+
+
+def test_broadcaster_replays_missed_events():
+    broadcaster = aipromtsdata.EventBroadcaster()
+    broadcaster.publish('prompt', {'version': 1})
+    broadcaster.publish('prompt', {'version': 2})
+    subscriber = broadcaster.subscribe(last_event_id=broadcaster.format_event_id(1))
+    assert subscriber.get_nowait()[0] == 2
+    assert subscriber.empty()
+
+
+def test_broadcaster_caps_subscribers():
+    broadcaster = aipromtsdata.EventBroadcaster(max_subscribers=1)
+    subscriber = broadcaster.subscribe()
+    assert broadcaster.subscribe() is None
+    broadcaster.unsubscribe(subscriber)
+    assert broadcaster.subscribe() is not None
+
+
+def test_injection_reports_success_after_insertion():
+    checker = aipromtsdata.EnhancedAIChecker()
+    script = checker.generate_injection_script('Claude', checker.ai_tools['Claude'])
+    callback = script.index('insertPromptText(textArea, "", () => {')
+    assert callback < script.index("KeyboardEvent('keyup'") < script.index('Prompt injected successfully')
+
+
+@pytest.mark.parametrize('selector, expected', [
+    ('textarea[placeholder*="Message"]', ('textarea', [('placeholder', '*=', 'Message')])),
+    ('div[contenteditable="true"]', ('div', [('contenteditable', '=', 'true')])),
+    ('button.send#go', ('button', [('class', '~=', 'send'), ('id', '=', 'go')])),
+    ('[disabled]', (None, [('disabled', None, None)])),
+    ('form textarea', None),
+])
+def test_compile_selector(selector, expected):
+    assert aipromtsdata.compile_selector(selector) == expected
+
+
+def test_validate_tool_fixture(tmp_path):
+    fixture = tmp_path / 'Tool.html'
+    fixture.write_text('<textarea placeholder="Message us"></textarea><button type="submit">Go</button>',
+                       encoding='utf-8')
+    config = {'selector': 'textarea[placeholder*="Message"]', 'submit_selector': 'button[aria-label="Send"]'}
+    result = aipromtsdata.validate_tool_fixture('Tool', str(fixture), config)
+    assert result['matches'] == {'selector': 1, 'submit_selector': 0}
+    assert not result['ok']
+
+    missing = aipromtsdata.validate_tool_fixture('Tool', str(tmp_path / 'missing.html'), config)
+    assert missing['error']
+
+
+def test_single_flight_shares_concurrent_calls():
+    flight = aipromtsdata.SingleFlight()
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'result'
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do('key', slow)))
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=lambda: results.append(flight.do('key', slow)))
+    follower.start()
+    time.sleep(0.05)
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert len(calls) == 1
+    assert sorted(results) == [('result', False), ('result', True)]
+
+
+def test_single_flight_linger_and_errors():
+    flight = aipromtsdata.SingleFlight()
+    assert flight.do('launch', lambda: 1, linger=60) == (1, False)
+    assert flight.do('launch', lambda: 2, linger=60) == (1, True)
+
+    def fail():
+        raise ValueError('boom')
+
+    with pytest.raises(ValueError):
+        flight.do('broken', fail, linger=60)
+    assert flight.do('broken', lambda: 'ok') == ('ok', False)
+
+
+def test_single_flight_pending():
+    flight = aipromtsdata.SingleFlight()
+    assert not flight.pending('launch')
+    flight.do('launch', lambda: 1, linger=60)
+    assert flight.pending('launch')
+    flight.do('render', lambda: 1)
+    assert not flight.pending('render')
+
+
+def test_write_static_file_skips_identical_content(tmp_path):
+    assert aipromtsdata.write_static_file(str(tmp_path), 'p/index.html', 'page')
+    assert not aipromtsdata.write_static_file(str(tmp_path), 'p/index.html', 'page')
+    assert aipromtsdata.write_static_file(str(tmp_path), 'p/index.html', 'changed')
+    assert (tmp_path / 'p' / 'index.html.gz').exists()
+
+
+def test_write_static_file_restores_missing_page(tmp_path):
+    aipromtsdata.write_static_file(str(tmp_path), 'p/index.html', 'page')
+    (tmp_path / 'p' / 'index.html').unlink()
+    assert aipromtsdata.write_static_file(str(tmp_path), 'p/index.html', 'page')
+    assert (tmp_path / 'p' / 'index.html').read_text() == 'page'
+
+
+def test_render_static_prompt_writes_one_script_per_tool(tmp_path):
+    ai_tools = {'Tool One': {'url': 'https://example.com', 'selector': 'textarea',
+                             'submit_selector': 'button', 'wait_time': 1}}
+    assets = {'css': 'assets/app.css', 'js': 'assets/app.js'}
+    slug, files, written = aipromtsdata.render_static_prompt('p', 'hi', ai_tools, assets, str(tmp_path))
+    assert set(files) == {'html', 'bookmarklet', 'inject/Tool_One'}
+    assert files['inject/Tool_One'].startswith('prompts/p/inject/Tool_One.')
+    assert written == 3
+
+
+def test_export_static_reports_missing_prompts(tmp_path):
+    checker = aipromtsdata.EnhancedAIChecker()
+    assert checker.export_static(str(tmp_path / 'missing'), str(tmp_path / 'dist')) is None
+
+
+def test_export_static_removes_directories_of_dropped_prompts(tmp_path):
+    prompts = tmp_path / 'prompts'
+    prompts.mkdir()
+    (prompts / 'keep.txt').write_text('kept prompt', encoding='utf-8')
+    (prompts / 'drop.txt').write_text('dropped prompt', encoding='utf-8')
+    dist = tmp_path / 'dist'
+    checker = aipromtsdata.EnhancedAIChecker()
+    checker.export_static(str(prompts), str(dist), workers=1)
+    assert (dist / 'prompts' / 'drop').is_dir()
+
+    (prompts / 'drop.txt').unlink()
+    checker.export_static(str(prompts), str(dist), workers=1)
+    assert not (dist / 'prompts' / 'drop').exists()
+    assert (dist / 'prompts' / 'keep').is_dir()
+
+
+def test_artifact_cache_evicts_least_recently_used():
+    cache = aipromtsdata.ArtifactCache(max_bytes=aipromtsdata.deep_sizeof('x' * 100) * 2)
+    cache.put('a', 'a' * 100)
+    cache.put('b', 'b' * 100)
+    assert cache.get_or_build('a', lambda: 'unused') == 'a' * 100
+    cache.put('c', 'c' * 100)
+
+    assert list(cache.entries) == ['a', 'c']
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['evictions'] == 1
+    assert stats['bytes'] <= stats['max_bytes']
+
+
+def test_artifact_cache_skips_oversized_values():
+    cache = aipromtsdata.ArtifactCache(max_bytes=10)
+    assert cache.get_or_build('big', lambda: 'x' * 1000) == 'x' * 1000
+    assert cache.stats()['entries'] == 0
+    assert cache.stats()['misses'] == 1
+
+
+def test_escaped_strings_are_shared():
+    checker = aipromtsdata.EnhancedAIChecker()
+    text = 'say "hi"\n' * 10
+    first = checker.escape_string_for_js(text)
+    assert checker.escape_string_for_js(''.join(list(text))) is first
+
+
+def test_escaped_string_cache_does_not_retain_source():
+    checker = aipromtsdata.EnhancedAIChecker()
+    text = 'prompt text ' * 100
+    checker.escape_string_for_js(text)
+    assert all(text not in key for key in checker.artifact_cache.entries)
+
+
+def test_memory_report_lists_artifact_sizes():
+    checker = aipromtsdata.EnhancedAIChecker()
+    checker.render_artifact('html', lambda snapshot: 'page')
+    report = checker.memory_report(stop=True)
+    assert report['note'] == 'tracemalloc is not running'
+    assert report['artifacts']['artifact_entries']['html:0'] > 0
+    assert report['artifacts']['artifact_bytes_by_name']['html'] > 0
+
+
+def apply_delta(base, ops):
+    """Python mirror of the dashboard's applyPromptDelta"""
+    lines = aipromtsdata.LINE_PATTERN.findall(base)
+    parts = []
+    index = 0
+    for op in ops:
+        if op[0] == '=':
+            parts.extend(lines[index:index + op[1]])
+            index += op[1]
+        elif op[0] == '-':
+            index += op[1]
+        else:
+            parts.append(op[1])
+    return ''.join(parts)
+
+
+def checker_with_history(*prompts):
+    checker = aipromtsdata.EnhancedAIChecker()
+    for version, prompt in enumerate(prompts, 1):
+        checker.set_prompt((version, prompt))
+    return checker
+
+
+def test_render_artifact_builds_from_its_snapshot():
+    checker = checker_with_history('one')
+    seen = []
+    result = checker.render_artifact('probe', lambda snapshot: seen.append(snapshot) or snapshot[1])
+    assert result == 'one'
+    assert seen == [(1, 'one')]
+
+
+@pytest.mark.parametrize('old, new', [
+    ('a\nb\nc', 'a\nB\nc'),
+    ('a\nb\nc\n', 'a\nc\n'),
+    ('', 'new\ntext'),
+    ('only line', ''),
+    ('no newline', 'no newline\nplus more'),
+    ('emoji 😀\nline\n', 'emoji 🚀😀\nline\nextra 𝄞'),
+])
+def test_prompt_delta_round_trip(old, new):
+    assert apply_delta(old, aipromtsdata.prompt_delta(old, new)) == new
+
+
+def test_prompt_update_sends_delta():
+    old = ''.join('line %d\n' % i for i in range(200))
+    new = old.replace('line 5\n', 'LINE 5\n')
+    checker = checker_with_history(old, new)
+    update = json.loads(checker.get_prompt_update(1))
+    assert update['version'] == 2
+    assert update['length'] == len(new)
+    assert apply_delta(old, update['ops']) == new
+
+
+def test_prompt_update_full_and_unchanged():
+    checker = checker_with_history('one', 'two')
+    epoch = checker.broadcaster.epoch
+    assert json.loads(checker.get_prompt_update('x')) == {'epoch': epoch, 'version': 2, 'prompt': 'two'}
+    assert json.loads(checker.get_prompt_update(2)) == {'epoch': epoch, 'version': 2, 'unchanged': True}
+
+
+def run_dashboard_delta(tmp_path, old, new):
+    """Apply the server's delta with the dashboard's own JavaScript in node"""
+    checker = checker_with_history(old, new)
+    update = checker.get_prompt_update(1)
+    js = checker.get_javascript()
+    apply_js = js[js.index('function applyPromptDelta'):js.index('function fetchPromptUpdate')]
+    script = tmp_path / 'apply.js'
+    script.write_text(apply_js + (
+        'const u = %s;'
+        'const t = applyPromptDelta(%s, u.ops);'
+        'console.log(JSON.stringify([t === %s, t.length === u.length]));'
+    ) % (update, json.dumps(old), json.dumps(new)), encoding='utf-8')
+    output = subprocess.run(['node', str(script)], capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='node not installed')
+def test_dashboard_applies_delta_like_server(tmp_path):
+    old = ''.join('row %d\n' % i for i in range(50))
+    assert run_dashboard_delta(tmp_path, old, old.replace('row 7\n', 'ROW 7\n')) == [True, True]
+
+
+def test_utf16_length_counts_surrogate_pairs():
+    assert aipromtsdata.utf16_length('abc') == 3
+    assert aipromtsdata.utf16_length('😀') == 2
+    assert aipromtsdata.utf16_length('a😀b') == 4
+
+
+def test_prompt_update_length_matches_javascript():
+    old = ''.join('line %d 😀\n' % i for i in range(200))
+    new = old.replace('line 5 ', 'LINE 5 🚀 ')
+    update = json.loads(checker_with_history(old, new).get_prompt_update(1))
+    assert update['length'] == aipromtsdata.utf16_length(new)
+
+
+def test_known_prompt_version_normalises_since():
+    checker = checker_with_history('one', 'two')
+    assert checker.known_prompt_version('1') == 1
+    assert checker.known_prompt_version('x1') is None
+    assert checker.known_prompt_version('99') is None
+    assert checker.known_prompt_version('') is None
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='node not installed')
+def test_dashboard_applies_non_bmp_delta(tmp_path):
+    old = ''.join('row %d 𝄞\n' % i for i in range(50))
+    assert run_dashboard_delta(tmp_path, old, old.replace('row 7 ', 'ROW 7 🚀 ')) == [True, True]
+
+
+def test_admission_sheds_when_queue_full():
+    admission = aipromtsdata.AdmissionController(route_limits={'/': 1, '*': 1}, max_queue=0)
+    assert admission.acquire('/')
+    assert not admission.acquire('/')
+    admission.release('/')
+    assert admission.acquire('/')
+    stats = admission.stats()['/']
+    assert stats['admitted'] == 2
+    assert stats['rejected'] == 1
+
+
+def test_admission_queue_times_out():
+    admission = aipromtsdata.AdmissionController(route_limits={'*': 1}, max_queue=1, queue_timeout=0.05)
+    assert admission.acquire('/static.css')
+    assert not admission.acquire('/other.js')
+    assert admission.stats()['*']['queued'] == 1
+
+
+def test_admission_rate_limits_action_routes():
+    admission = aipromtsdata.AdmissionController(rate_limits={'/open-all': (0.001, 2)})
+    assert admission.check_rate('127.0.0.1', '/open-all') == 0
+    assert admission.check_rate('127.0.0.1', '/open-all') == 0
+    assert admission.check_rate('127.0.0.1', '/open-all') > 0
+    assert admission.check_rate('10.0.0.2', '/open-all') == 0
+    assert admission.check_rate('127.0.0.1', '/') == 0
+
+
+def test_launch_coalescing_ignores_prompt_version():
+    checker = aipromtsdata.EnhancedAIChecker()
+    launches = []
+    checker.open_all_tools = lambda: launches.append(1)
+    assert not checker.launch_all_tools()
+    checker.prompt_snapshot = (checker.prompt_version + 1, 'edited')
+    assert checker.single_flight.pending('open-all')
+    assert checker.launch_all_tools()
+    assert launches == [1]
+
+
+def test_joined_launches_do_not_queue_for_admission():
+    checker = aipromtsdata.EnhancedAIChecker()
+    checker.admission = aipromtsdata.AdmissionController(route_limits={'/open-all': 1, '*': 1},
+                                                         max_queue=0)
+    release = threading.Event()
+    checker.open_all_tools = lambda: release.wait(5)
+    results = []
+    callers = [threading.Thread(target=lambda: results.append(checker.launch_all_tools())) for _ in range(6)]
+    for caller in callers:
+        caller.start()
+    time.sleep(0.1)
+    release.set()
+    for caller in callers:
+        caller.join()
+    assert sorted(results) == [False] + [True] * 5
+    assert checker.admission.stats()['/open-all']['rejected'] == 0
+
+
+def test_rejected_launch_raises_for_every_caller():
+    checker = aipromtsdata.EnhancedAIChecker()
+    checker.admission = aipromtsdata.AdmissionController(route_limits={'/open-all': 0, '*': 1},
+                                                         max_queue=0)
+    with pytest.raises(aipromtsdata.AdmissionRejected):
+        checker.launch_all_tools()
+
+
+def test_prompt_delta_stays_fast_on_repeated_lines():
+    paragraphs = ''.join('Paragraph %d of the prompt.\n\n}\n\n' % i for i in range(30000))
+    assert len(paragraphs) > 1000000
+    edited = paragraphs.replace('Paragraph 15000 ', 'Edited paragraph 15000 ')
+    reordered = '\n\n'.join(reversed(paragraphs.split('\n\n')))
+
+    started = time.perf_counter()
+    assert aipromtsdata.prompt_delta(paragraphs, paragraphs) == [['=', 120000]]
+    ops = aipromtsdata.prompt_delta(paragraphs, edited)
+    assert apply_delta(paragraphs, ops) == edited
+    assert apply_delta(paragraphs, aipromtsdata.prompt_delta(paragraphs, reordered)) == reordered
+    assert time.perf_counter() - started < 2
+    assert len(json.dumps(ops)) < 200
+
+
+def test_prompt_updates_prepared_once_per_change():
+    checker = checker_with_history('one\n', 'one\ntwo\n')
+    checker.prepare_prompt_updates()
+    assert (('prompt-update', 1), 2) in checker.artifact_cache.entries
+    update = checker.render_artifact(('prompt-update', 1), lambda snapshot: pytest.fail('delta rebuilt'))
+    assert json.loads(update)['version'] == 2
+
+
+def test_prompt_history_counts_against_cache_budget():
+    checker = aipromtsdata.EnhancedAIChecker()
+    checker.artifact_cache.max_bytes = aipromtsdata.deep_sizeof('x' * 1000) * 2
+    for version in range(1, 5):
+        checker.set_prompt((version, str(version) * 1000))
+    assert checker.artifact_cache.stats()['bytes'] <= checker.artifact_cache.max_bytes
+    assert checker.known_prompt_version('1') is None
+    update = json.loads(checker.get_prompt_update(1))
+    assert (update['version'], update['prompt']) == (4, '4' * 1000)
+    assert checker.known_prompt_version('3') == 3
+
+
+def test_prompt_history_drops_forgotten_texts():
+    checker = aipromtsdata.EnhancedAIChecker()
+    for version in range(1, 13):
+        checker.set_prompt((version, 'text %d' % version))
+    assert list(checker.prompt_history) == list(range(3, 13))
+    assert ('prompt-text', 2) not in checker.artifact_cache.entries
+
+
+def test_metrics_are_not_replayed():
+    broadcaster = aipromtsdata.EventBroadcaster()
+    broadcaster.publish('prompt', {'version': 1})
+    broadcaster.publish('metrics', {'viewers': 3}, replay=False)
+    assert [message[1] for message in broadcaster.history] == ['prompt']
+    assert broadcaster.subscribe(last_event_id=broadcaster.format_event_id(0)).qsize() == 1
+
+
+def test_metrics_pushes_are_coalesced():
+    checker = aipromtsdata.EnhancedAIChecker()
+    checker.metrics_interval = 0.2
+    subscriber = checker.broadcaster.subscribe()
+    for _ in range(50):
+        checker.publish_metrics()
+    time.sleep(0.5)
+    messages = [subscriber.get_nowait() for _ in range(subscriber.qsize())]
+    assert 1 <= len(messages) <= 2
+    assert all(event_id is None and event == 'metrics' for event_id, event, _ in messages)
+
+
+def test_event_ids_from_a_previous_process_replay_everything():
+    broadcaster = aipromtsdata.EventBroadcaster()
+    broadcaster.publish('prompt', {'version': 1})
+    broadcaster.publish('prompt', {'version': 2})
+    assert broadcaster.parse_event_id('garbage') is None
+    assert broadcaster.subscribe(last_event_id='0000beef-57').qsize() == 2
+
+
+def test_since_from_another_epoch_gets_the_full_prompt():
+    checker = checker_with_history('one', 'two')
+    assert checker.known_prompt_version('1', checker.broadcaster.epoch) == 1
+    assert checker.known_prompt_version('1', 'stale') is None
+    assert checker.known_prompt_version('1', '') is None
+
+
+def test_profile_counts_only_busy_request_threads():
+    checker = aipromtsdata.EnhancedAIChecker()
+    stop = threading.Event()
+
+    def busy_render(name, builder):
+        while not stop.is_set():
+            sum(range(100))
+        return ''
+
+    checker.render_artifact = busy_render
+    handler = aipromtsdata.CustomHTTPRequestHandler.__new__(aipromtsdata.CustomHTTPRequestHandler)
+    handler.checker = checker
+    handler.send_response = handler.send_header = lambda *args: None
+    handler.end_headers = lambda: None
+    handler.wfile = io.BytesIO()
+    threads = [threading.Thread(target=handler.route_request, args=('/',)),
+               threading.Thread(target=threading.Event().wait, args=(5,), daemon=True)]
+    for thread in threads:
+        thread.start()
+    try:
+        report = checker.sample_profile(0.2)
+    finally:
+        stop.set()
+        threads[0].join()
+    assert 'busy_render' in report
+    assert 'route_request' in report
+    assert 'wait (threading.py' not in report